@@ -1,16 +1,19 @@
+import asyncio
 import datetime
+import hashlib
+import json
 from contextlib import asynccontextmanager
 from typing import Any
 
 import logfire
 import marvin
-from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from apple_music import AppleMusicClient
-from apple_music.settings import settings
+from apple_music import get_client
 
 
 @asynccontextmanager
@@ -18,7 +21,9 @@ async def lifespan(app: FastAPI):
     """Context manager to ensure the app is closed properly."""
     with logfire.span("Running app", start_time=datetime.datetime.now(datetime.UTC)):
         try:
-            yield
+            async with get_client() as client:
+                app.state.apple_music = client
+                yield
         finally:
             logfire.info("Exiting app")
 
@@ -29,17 +34,14 @@ router = APIRouter(prefix="/api")
 templates = Jinja2Templates(directory="spotify2apple/templates")
 
 
-logfire.configure(pydantic_plugin=logfire.PydanticPlugin(record="all"))
+logfire.configure()
+logfire.instrument_pydantic(record="all")
 logfire.instrument_fastapi(app)
 
 
-async def get_developer_token() -> str:
-    async with AppleMusicClient(
-        private_key=settings.auth.private_key.get_secret_value(),
-        key_id=settings.auth.key_id,
-        team_id=settings.auth.team_id,
-    ) as client:
-        return client._generate_token()
+async def get_developer_token(request: Request) -> str:
+    """Reuse the app's client so the token is only re-signed once it expires."""
+    return request.app.state.apple_music._get_token()
 
 
 @router.get("/developer-token")
@@ -76,6 +78,63 @@ async def get_apple_playlists() -> list[dict[str, Any]]:
     return [{"id": "123", "name": "Test Playlist"}]
 
 
+def _etag_matches(etag: str, if_none_match: str | None) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/bootstrap")
+async def bootstrap(
+    request: Request,
+    welcome: bool = True,
+    spotify: bool = False,
+    apple: bool = False,
+) -> Response:
+    """Everything the UI needs on load, computed concurrently in one round trip.
+
+    Only the developer token is required; any other section that fails is
+    logged, left out of the body and named in its `errors` list so the UI can
+    still start and report it.
+
+    The response carries an `ETag` over its body, so a repeat load with a
+    matching `If-None-Match` gets an empty 304. The ETag is computed after the
+    sections are generated, so a 304 saves bandwidth but not server work, and
+    since the welcome message and Spotify playlists are non-deterministic
+    generated output, in practice only responses without them revalidate.
+    """
+    tasks = {"token": get_developer_token(request)}
+    if welcome:
+        tasks["welcome_message"] = welcome_message()
+    if spotify:
+        tasks["spotify_playlists"] = get_spotify_playlists()
+    if apple:
+        tasks["apple_playlists"] = get_apple_playlists()
+
+    results = dict(
+        zip(tasks, await asyncio.gather(*tasks.values(), return_exceptions=True))
+    )
+    errors = []
+    for section, result in list(results.items()):
+        if not isinstance(result, BaseException):
+            continue
+        if section == "token" or not isinstance(result, Exception):
+            raise result
+        logfire.error(f"Failed to load bootstrap section {section!r}: {result!r}")
+        del results[section]
+        errors.append(section)
+    results["errors"] = errors
+
+    body = json.dumps(jsonable_encoder(results), sort_keys=True).encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _etag_matches(etag, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.post("/migrate-playlists")
 async def migrate_playlists(user_token: str, playlists: list[str]):
     # TODO: Implement the logic to migrate playlists to Apple Music
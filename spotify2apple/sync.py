@@ -0,0 +1,303 @@
+import asyncio
+import hashlib
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterator
+
+import logfire
+import spotipy
+from pydantic import BaseModel, Field
+
+from apple_music import AppleMusicClient, get_client
+
+ISRC_BATCH_SIZE = 25
+STATE_DIR = Path(".sync_state")
+PLAYLIST_ITEM_FIELDS = (
+    "items(track(id,uri,name,artists(name),album(name),external_ids)),next"
+)
+
+
+class PlaylistState(BaseModel):
+    """What we last synced for a single Spotify playlist."""
+
+    snapshot_id: str = Field(..., description="The Spotify snapshot ID last synced.")
+    apple_playlist_id: str | None = Field(
+        None, description="The Apple Music library playlist synced into."
+    )
+    tracks: dict[str, str | None] = Field(
+        default_factory=dict,
+        description="Track key -> matched Apple Music song ID (None if unmatched).",
+    )
+    orphaned: dict[str, str] = Field(
+        default_factory=dict,
+        description="Track key -> Apple Music song ID for tracks removed on Spotify "
+        "but still in the Apple Music playlist.",
+    )
+
+
+class SyncState(BaseModel):
+    """Locally persisted sync state for one user, keyed by Spotify playlist ID."""
+
+    playlists: dict[str, PlaylistState] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "SyncState":
+        if not path.exists():
+            return cls()
+        return cls.model_validate_json(path.read_text())
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write then rename, so an interrupted save can't leave truncated JSON
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(self.model_dump_json(indent=2))
+        tmp_path.replace(path)
+
+
+class PlaylistSyncResult(BaseModel):
+    playlist_id: str
+    skipped: bool = False
+    added: list[str] = Field(default_factory=list)
+    removed: list[str] = Field(default_factory=list)
+    unmatched: list[str] = Field(default_factory=list)
+    error: str | None = None
+
+
+def track_hash(track: dict[str, Any]) -> str:
+    """Hash the parts of a Spotify track that affect how it is matched."""
+    content = {
+        "id": track.get("id") or track.get("uri"),
+        "name": track.get("name"),
+        "artists": [artist.get("name") for artist in track.get("artists") or []],
+        "album": (track.get("album") or {}).get("name"),
+        "isrc": (track.get("external_ids") or {}).get("isrc"),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def diff_tracks(
+    previous: dict[str, str | None], current: dict[str, dict[str, Any]]
+) -> tuple[list[str], list[str]]:
+    """Return the track keys added to and removed from a playlist, in order."""
+    added = [key for key in current if key not in previous]
+    removed = [key for key in previous if key not in current]
+    return added, removed
+
+
+def _paginate(spotify: spotipy.Spotify, page: dict[str, Any]) -> Iterator[Any]:
+    while page:
+        yield from page["items"]
+        page = spotify.next(page) if page.get("next") else None
+
+
+def _get_playlists(spotify: spotipy.Spotify) -> list[dict[str, Any]]:
+    return list(_paginate(spotify, spotify.current_user_playlists(limit=50)))
+
+
+def _get_tracks(
+    spotify: spotipy.Spotify, playlist_id: str
+) -> dict[str, dict[str, Any]]:
+    """Fetch a playlist's tracks keyed by `<content hash>:<occurrence>`.
+
+    The occurrence index keeps a track that appears more than once in the
+    playlist as separate entries.
+    """
+    page = spotify.playlist_items(
+        playlist_id, fields=PLAYLIST_ITEM_FIELDS, additional_types=("track",)
+    )
+    occurrences: Counter[str] = Counter()
+    tracks = {}
+    for item in _paginate(spotify, page):
+        if not (track := item.get("track")):
+            continue
+        hash_ = track_hash(track)
+        tracks[f"{hash_}:{occurrences[hash_]}"] = track
+        occurrences[hash_] += 1
+    return tracks
+
+
+async def match_tracks(
+    apple: AppleMusicClient, tracks: dict[str, dict[str, Any]]
+) -> dict[str, str | None]:
+    """Match Spotify tracks to Apple Music song IDs.
+
+    Tracks with an ISRC are looked up in batches; the rest fall back to search.
+    """
+    matches: dict[str, str | None] = dict.fromkeys(tracks)
+
+    by_isrc: dict[str, list[str]] = {}
+    for key, track in tracks.items():
+        if isrc := (track.get("external_ids") or {}).get("isrc"):
+            by_isrc.setdefault(isrc.upper(), []).append(key)
+
+    isrcs = list(by_isrc)
+    for i in range(0, len(isrcs), ISRC_BATCH_SIZE):
+        response = await apple.get_resource_by_filter(
+            "isrc", isrcs[i : i + ISRC_BATCH_SIZE], "songs"
+        )
+        for song in response.get("data", []):
+            isrc = song.get("attributes", {}).get("isrc", "").upper()
+            for key in by_isrc.get(isrc, []):
+                matches[key] = matches[key] or song["id"]
+
+    for key, track in tracks.items():
+        if matches[key]:
+            continue
+        artists = " ".join(artist["name"] for artist in track.get("artists") or [])
+        results = await apple.search(f"{track['name']} {artists}", limit=1)
+        for result in results.results.values():
+            if result.data:
+                matches[key] = result.data[0].id
+                break
+
+    return matches
+
+
+async def sync_playlist(
+    spotify: spotipy.Spotify,
+    apple: AppleMusicClient,
+    user_token: str,
+    playlist: dict[str, Any],
+    state: SyncState,
+) -> PlaylistSyncResult:
+    """Bring one Apple Music playlist up to date with its Spotify source.
+
+    Unchanged playlists (same `snapshot_id`) are skipped without fetching their
+    tracks. Otherwise only added tracks, plus any that previously matched
+    nothing, are matched and written. The Apple Music API can't remove tracks
+    from library playlists, so removed tracks are kept as orphans and reclaimed
+    (rather than appended again) if the same song comes back, e.g. when a track
+    is re-added or its metadata changes on Spotify.
+    """
+    playlist_id = playlist["id"]
+    previous = state.playlists.get(playlist_id)
+    if previous and previous.snapshot_id == playlist["snapshot_id"]:
+        return PlaylistSyncResult(playlist_id=playlist_id, skipped=True)
+
+    tracks = await asyncio.to_thread(_get_tracks, spotify, playlist_id)
+    previous_tracks = previous.tracks if previous else {}
+    orphaned = dict(previous.orphaned) if previous else {}
+    added, removed = diff_tracks(previous_tracks, tracks)
+    for key in removed:
+        if song_id := previous_tracks[key]:
+            orphaned[key] = song_id
+
+    # tracks removed and re-added keep their key, so they don't need matching
+    reclaimed = {key: orphaned.pop(key) for key in added if key in orphaned}
+    # previously unmatched tracks are retried, as the catalog may have gained them
+    to_match = {
+        key: track
+        for key, track in tracks.items()
+        if key not in reclaimed and previous_tracks.get(key) is None
+    }
+    matches = reclaimed | await match_tracks(apple, to_match)
+
+    apple_playlist_id = previous.apple_playlist_id if previous else None
+    if apple_playlist_id is None:
+        response = await apple.create_library_playlist(playlist["name"], user_token)
+        apple_playlist_id = response["data"][0]["id"]
+        # persist the new playlist now so a failure below doesn't orphan it
+        state.playlists[playlist_id] = PlaylistState(
+            snapshot_id="", apple_playlist_id=apple_playlist_id
+        )
+
+    # a song still in the Apple Music playlist as an orphan is reclaimed, not re-added
+    song_ids = []
+    for key in to_match:
+        if not (song_id := matches[key]):
+            continue
+        if orphan := next((k for k, v in orphaned.items() if v == song_id), None):
+            del orphaned[orphan]
+        else:
+            song_ids.append(song_id)
+
+    if song_ids:
+        await apple.add_tracks_to_library_playlist(
+            apple_playlist_id, song_ids, user_token
+        )
+
+    state.playlists[playlist_id] = PlaylistState(
+        snapshot_id=playlist["snapshot_id"],
+        apple_playlist_id=apple_playlist_id,
+        tracks={
+            key: matches[key] if key in matches else previous_tracks[key]
+            for key in tracks
+        },
+        orphaned=orphaned,
+    )
+    return PlaylistSyncResult(
+        playlist_id=playlist_id,
+        added=[key for key, song_id in matches.items() if song_id],
+        removed=removed,
+        unmatched=[key for key, song_id in matches.items() if not song_id],
+    )
+
+
+async def sync_playlists(
+    spotify: spotipy.Spotify,
+    apple: AppleMusicClient,
+    user_token: str,
+    state_path: Path,
+    playlist_ids: list[str] | None = None,
+) -> list[PlaylistSyncResult]:
+    """Incrementally sync a user's Spotify playlists into Apple Music.
+
+    Args:
+        spotify: An authorized Spotify client for the user.
+        apple: An Apple Music client.
+        user_token: The user's Music User Token.
+        state_path: Where this user's sync state is persisted between runs.
+        playlist_ids: Restrict the sync to these Spotify playlists. Defaults to all.
+
+    Returns:
+        One result per playlist considered.
+    """
+    state = SyncState.load(state_path)
+    playlists = await asyncio.to_thread(_get_playlists, spotify)
+    if playlist_ids is not None:
+        playlists = [p for p in playlists if p["id"] in playlist_ids]
+
+    results = []
+    try:
+        for playlist in playlists:
+            with logfire.span("Syncing playlist {name}", name=playlist["name"]):
+                try:
+                    result = await sync_playlist(
+                        spotify, apple, user_token, playlist, state
+                    )
+                except Exception as exc:
+                    logfire.exception(f"Failed to sync {playlist['name']!r}")
+                    results.append(
+                        PlaylistSyncResult(playlist_id=playlist["id"], error=repr(exc))
+                    )
+                    continue
+            logfire.info(
+                f"Synced {playlist['name']!r}: skipped={result.skipped} "
+                f"added={len(result.added)} removed={len(result.removed)} "
+                f"unmatched={len(result.unmatched)}"
+            )
+            results.append(result)
+    finally:
+        state.save(state_path)
+    return results
+
+
+async def main(
+    user_token: str, state_dir: Path = STATE_DIR
+) -> list[PlaylistSyncResult]:
+    """Sync the authorized Spotify user's playlists, keeping one state file per user."""
+    # imported here so the sync logic doesn't require prefect
+    from spotify2apple.spotify import SpotifyCredentials
+
+    spotify = SpotifyCredentials().get_client()
+    user_id = (await asyncio.to_thread(spotify.current_user))["id"]
+    async with get_client() as apple:
+        return await sync_playlists(
+            spotify, apple, user_token, state_dir / f"{user_id}.json"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(user_token=sys.argv[1]))
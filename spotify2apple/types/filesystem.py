@@ -0,0 +1,13 @@
+from pathlib import Path
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def _ensure_parent(path: Path) -> Path:
+    path = path.expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+EnsuredPath = Annotated[Path, AfterValidator(_ensure_parent)]
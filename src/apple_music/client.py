@@ -129,11 +129,15 @@ class AppleMusicClient(BaseModel):
             self._token = self._generate_token()
         return self._token
 
-    async def _request(self, method: str, url: str, **kwargs) -> dict[str, Any]:
+    async def _request(
+        self, method: str, url: str, user_token: str | None = None, **kwargs
+    ) -> dict[str, Any]:
         headers = {
             "Authorization": f"Bearer {self._get_token()}",
             "Content-Type": "application/json",
         }
+        if user_token:
+            headers["Music-User-Token"] = user_token
         if not url.startswith("http"):
             url = str(self.root) + url
 
@@ -141,6 +145,8 @@ class AppleMusicClient(BaseModel):
             method, url, headers=headers, **kwargs
         )
         response.raise_for_status()
+        if not response.content:
+            return {}
         return response.json()
 
     async def get_resource(
@@ -227,6 +233,58 @@ class AppleMusicClient(BaseModel):
         )
         return SearchResponse.model_validate(response_data)
 
+    async def create_library_playlist(
+        self,
+        name: str,
+        user_token: str,
+        description: str | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Create a playlist in the user's Apple Music library.
+
+        Args:
+            name (str): The name of the playlist.
+            user_token (str): The Music User Token of the library owner.
+            description (str, optional): The description of the playlist. Defaults to None.
+            **kwargs: Additional keyword arguments to pass to the request.
+
+        Returns:
+            dict[str, Any]: The created library playlist resource.
+        """
+        attributes = {"name": name}
+        if description:
+            attributes["description"] = description
+        return await self._request(
+            "POST",
+            "me/library/playlists",
+            user_token=user_token,
+            json={"attributes": attributes},
+            **kwargs,
+        )
+
+    async def add_tracks_to_library_playlist(
+        self,
+        playlist_id: str,
+        song_ids: list[str],
+        user_token: str,
+        **kwargs,
+    ) -> None:
+        """Append catalog songs to a playlist in the user's Apple Music library.
+
+        Args:
+            playlist_id (str): The library playlist ID.
+            song_ids (list[str]): The catalog IDs of the songs to add.
+            user_token (str): The Music User Token of the library owner.
+            **kwargs: Additional keyword arguments to pass to the request.
+        """
+        await self._request(
+            "POST",
+            f"me/library/playlists/{playlist_id}/tracks",
+            user_token=user_token,
+            json={"data": [{"id": id_, "type": "songs"} for id_ in song_ids]},
+            **kwargs,
+        )
+
 
 @asynccontextmanager
 async def get_client() -> AsyncGenerator[AppleMusicClient, None]:
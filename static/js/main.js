@@ -5,29 +5,34 @@ const WELCOME_MESSAGE_KEY = 'welcomeMessage';
 const WELCOME_MESSAGE_EXPIRY_KEY = 'welcomeMessageExpiry';
 
 // Helper functions
-async function fetchWelcomeMessage() {
-    const cachedMessage = localStorage.getItem('welcomeMessage');
-    const cacheExpiry = localStorage.getItem('welcomeMessageExpiry');
+function getCachedWelcomeMessage() {
+    const cachedMessage = localStorage.getItem(WELCOME_MESSAGE_KEY);
+    const cacheExpiry = localStorage.getItem(WELCOME_MESSAGE_EXPIRY_KEY);
 
     if (cachedMessage && Date.now() < Number(cacheExpiry)) {
         return cachedMessage;
     }
+    return null;
+}
 
-    try {
-        const response = await fetch('/api/welcome-message');
-        const data = await response.json();
-        const message = data.response || 'Welcome to Spotify2Apple!';
-
-        const expiry = Date.now() + 24 * 60 * 60 * 1000; // 24 hours from now
-        localStorage.setItem('welcomeMessage', message);
-        console.log("New welcome message fetched and cached:", message);
-        localStorage.setItem('welcomeMessageExpiry', expiry.toString());
+function cacheWelcomeMessage(message) {
+    const expiry = Date.now() + 24 * 60 * 60 * 1000; // 24 hours from now
+    localStorage.setItem(WELCOME_MESSAGE_KEY, message);
+    localStorage.setItem(WELCOME_MESSAGE_EXPIRY_KEY, expiry.toString());
+    console.log("New welcome message fetched and cached:", message);
+}
 
-        return message;
-    } catch (error) {
-        console.error('Failed to fetch welcome message:', error);
-        return 'Welcome to Spotify2Apple!';
+// Fetch everything needed on load in a single round trip. The server sends an
+// ETag, so the browser revalidates repeat loads and gets a 304 when unchanged.
+async function fetchBootstrap({ welcome, spotify, apple }) {
+    const params = new URLSearchParams({ welcome, spotify, apple });
+    const response = await fetch(`/api/bootstrap?${params}`);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
     }
+    const data = await response.json();
+    console.log("Bootstrap data fetched successfully");
+    return data;
 }
 
 async function authorizeUser(service) {
@@ -129,19 +134,31 @@ async function initializeApp() {
     console.log("Initializing app...");
 
     try {
-        const welcomeMessage = await fetchWelcomeMessage();
+        // Check for existing tokens so the server only does the work we need
+        const spotifyToken = localStorage.getItem('SpotifyUserToken');
+        const appleMusicToken = localStorage.getItem('AppleMusicUserToken');
+        const cachedWelcomeMessage = getCachedWelcomeMessage();
+
+        const data = await fetchBootstrap({
+            welcome: !cachedWelcomeMessage,
+            spotify: !!spotifyToken,
+            apple: !!appleMusicToken,
+        });
+
+        let welcomeMessage = cachedWelcomeMessage;
+        if (!welcomeMessage && data.welcome_message) {
+            welcomeMessage = data.welcome_message;
+            cacheWelcomeMessage(welcomeMessage);
+        }
+        // Don't cache the fallback, so the next load asks for a message again
+        welcomeMessage = welcomeMessage || 'Welcome to Spotify2Apple!';
         const welcomeElement = document.getElementById('welcome-message');
         if (welcomeElement) {
             welcomeElement.textContent = welcomeMessage;
         }
 
-        const response = await fetch('/api/developer-token');
-        const data = await response.json();
-        const developerToken = data.token;
-        console.log("Developer token fetched successfully");
-
         MusicKit.configure({
-            developerToken: developerToken,
+            developerToken: data.token,
             app: {
                 name: 'Spotify2Apple',
                 build: '1.0.0'
@@ -152,21 +169,25 @@ async function initializeApp() {
         // Set up event listeners
         setupEventListeners();
 
-        // Check for existing tokens and update button states
-        const spotifyToken = localStorage.getItem('SpotifyUserToken');
-        const appleMusicToken = localStorage.getItem('AppleMusicUserToken');
-
         updateButtonState('spotify-login', !!spotifyToken);
         updateButtonState('apple-login', !!appleMusicToken);
 
+        const errors = data.errors || [];
+
         if (spotifyToken) {
-            const spotifyPlaylists = await loadPlaylists('Spotify');
-            displayPlaylists(spotifyPlaylists, 'spotify-playlists');
+            if (errors.includes('spotify_playlists')) {
+                showError('An error occurred while loading Spotify playlists.');
+            } else {
+                displayPlaylists(data.spotify_playlists, 'spotify-playlists');
+            }
         }
 
         if (appleMusicToken) {
-            const appleMusicPlaylists = await loadPlaylists('AppleMusic');
-            displayPlaylists(appleMusicPlaylists, 'apple-playlists');
+            if (errors.includes('apple_playlists')) {
+                showError('An error occurred while loading AppleMusic playlists.');
+            } else {
+                displayPlaylists(data.apple_playlists, 'apple-playlists');
+            }
         }
 
         // Show migrate button if both services are authorized
@@ -0,0 +1,30 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from apple_music import AppleMusicClient
+
+
+@pytest.fixture(scope="module")
+def private_key_bytes() -> bytes:
+    key = ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+@pytest.fixture(params=["bytes", "str"])  # run suite both with bytes and str
+def private_key(request, private_key_bytes: bytes) -> str | bytes:
+    if request.param == "bytes":
+        return private_key_bytes
+    else:
+        return private_key_bytes.decode()
+
+
+@pytest.fixture
+def client(private_key: str | bytes) -> AppleMusicClient:
+    return AppleMusicClient(
+        private_key=private_key, key_id="test_key_id", team_id="test_team_id"
+    )
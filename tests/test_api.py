@@ -0,0 +1,53 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from spotify2apple import api
+
+
+@pytest.fixture
+def test_client(monkeypatch, client) -> TestClient:
+    async def welcome_message() -> str:
+        return "hello"
+
+    async def get_spotify_playlists() -> list[dict]:
+        return [{"id": "abc", "name": "Spotify Playlist"}]
+
+    monkeypatch.setattr(api, "welcome_message", welcome_message)
+    monkeypatch.setattr(api, "get_spotify_playlists", get_spotify_playlists)
+    monkeypatch.setattr(api.app.state, "apple_music", client, raising=False)
+    return TestClient(api.app)
+
+
+def test_bootstrap(test_client):
+    response = test_client.get(
+        "/api/bootstrap", params={"spotify": True, "apple": True}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["token"] and len(data["token"].split(".")) == 3
+    assert data["welcome_message"] == "hello"
+    assert data["spotify_playlists"] == [{"id": "abc", "name": "Spotify Playlist"}]
+    assert data["apple_playlists"] == [{"id": "123", "name": "Test Playlist"}]
+    assert data["errors"] == []
+    assert response.headers["ETag"]
+
+
+def test_bootstrap_not_modified(test_client):
+    etag = test_client.get("/api/bootstrap").headers["ETag"]
+    response = test_client.get(
+        "/api/bootstrap", headers={"If-None-Match": f'"other", {etag}'}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_bootstrap_omits_failed_sections(test_client, monkeypatch):
+    async def welcome_message() -> str:
+        raise RuntimeError("no welcome for you")
+
+    monkeypatch.setattr(api, "welcome_message", welcome_message)
+    response = test_client.get("/api/bootstrap")
+    assert response.status_code == 200
+    assert "welcome_message" not in response.json()
+    assert response.json()["errors"] == ["welcome_message"]
+    assert response.json()["token"]
@@ -1,39 +1,11 @@
+import json
 from datetime import datetime, timedelta
 
 import httpx
 import pytest
 import respx
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import ec
 from httpx import Response
 
-from apple_music import AppleMusicClient
-
-
-@pytest.fixture(scope="module")
-def private_key_bytes() -> bytes:
-    key = ec.generate_private_key(ec.SECP256R1())
-    return key.private_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption(),
-    )
-
-
-@pytest.fixture(params=["bytes", "str"])  # run suite both with bytes and str
-def private_key(request, private_key_bytes: bytes) -> str | bytes:
-    if request.param == "bytes":
-        return private_key_bytes
-    else:
-        return private_key_bytes.decode()
-
-
-@pytest.fixture
-def client(private_key: str | bytes) -> AppleMusicClient:
-    return AppleMusicClient(
-        private_key=private_key, key_id="test_key_id", team_id="test_team_id"
-    )
-
 
 def test_token_generation(client):
     token = client._get_token()
@@ -88,6 +60,33 @@ async def test_get_resource_by_filter(client):
         assert result == {"data": [{"id": "123", "type": "songs"}]}
 
 
+async def test_create_library_playlist(client):
+    with respx.mock:
+        route = respx.post("https://api.music.apple.com/v1/me/library/playlists").mock(
+            return_value=Response(
+                201, json={"data": [{"id": "p.123", "type": "library-playlists"}]}
+            )
+        )
+        result = await client.create_library_playlist("Test", user_token="user")
+        assert result == {"data": [{"id": "p.123", "type": "library-playlists"}]}
+        request = route.calls.last.request
+        assert request.headers["Music-User-Token"] == "user"
+        assert json.loads(request.content) == {"attributes": {"name": "Test"}}
+
+
+async def test_add_tracks_to_library_playlist(client):
+    with respx.mock:
+        route = respx.post(
+            "https://api.music.apple.com/v1/me/library/playlists/p.123/tracks"
+        ).mock(return_value=Response(204))
+        await client.add_tracks_to_library_playlist(
+            "p.123", ["123", "456"], user_token="user"
+        )
+        assert json.loads(route.calls.last.request.content) == {
+            "data": [{"id": "123", "type": "songs"}, {"id": "456", "type": "songs"}]
+        }
+
+
 async def test_error_handling(client):
     with respx.mock:
         respx.get("https://api.music.apple.com/v1/catalog/us/songs/999").mock(
@@ -0,0 +1,253 @@
+import json
+from unittest.mock import MagicMock
+
+import respx
+import spotipy
+from httpx import Response
+
+from spotify2apple.sync import (
+    PlaylistState,
+    SyncState,
+    diff_tracks,
+    sync_playlists,
+    track_hash,
+)
+
+SONGS_URL = "https://api.music.apple.com/v1/catalog/us/songs"
+LIBRARY_URL = "https://api.music.apple.com/v1/me/library/playlists"
+
+
+def make_track(name: str, isrc: str) -> dict:
+    return {
+        "id": name.lower(),
+        "uri": f"spotify:track:{name.lower()}",
+        "name": name,
+        "artists": [{"name": "Artist"}],
+        "album": {"name": "Album"},
+        "external_ids": {"isrc": isrc},
+    }
+
+
+def key(track: dict, occurrence: int = 0) -> str:
+    return f"{track_hash(track)}:{occurrence}"
+
+
+TRACK_A = make_track("A", "ISRC_A")
+TRACK_B = make_track("B", "ISRC_B")
+
+
+def make_spotify(playlists: list[dict], tracks: list[dict]) -> MagicMock:
+    spotify = MagicMock(spec=spotipy.Spotify)
+    spotify.current_user_playlists.return_value = {"items": playlists, "next": None}
+    spotify.playlist_items.return_value = {
+        "items": [{"track": track} for track in tracks],
+        "next": None,
+    }
+    return spotify
+
+
+def test_diff_tracks():
+    previous = {"a:0": "1", "b:0": "2"}
+    current = {"b:0": {}, "c:0": {}, "c:1": {}}
+    assert diff_tracks(previous, current) == (["c:0", "c:1"], ["a:0"])
+
+
+def test_track_hash_is_stable():
+    reordered = dict(reversed(list(TRACK_A.items())))
+    assert track_hash(reordered) == track_hash(TRACK_A)
+    assert track_hash({**TRACK_A, "popularity": 99}) == track_hash(TRACK_A)
+    assert track_hash({**TRACK_A, "name": "A (Remastered)"}) != track_hash(TRACK_A)
+
+
+def test_sync_state_round_trip(tmp_path):
+    path = tmp_path / "state" / "user.json"
+    state = SyncState(
+        playlists={
+            "p1": PlaylistState(
+                snapshot_id="s1",
+                apple_playlist_id="p.1",
+                tracks={"a:0": "1", "b:0": None},
+                orphaned={"c:0": "3"},
+            )
+        }
+    )
+    state.save(path)
+    assert SyncState.load(path) == state
+    assert list(path.parent.iterdir()) == [path]  # no temp file left behind
+    assert SyncState.load(tmp_path / "missing.json") == SyncState()
+
+
+async def test_unchanged_playlist_is_skipped(client, tmp_path):
+    path = tmp_path / "user.json"
+    SyncState(
+        playlists={"p1": PlaylistState(snapshot_id="s1", apple_playlist_id="p.1")}
+    ).save(path)
+    spotify = make_spotify([{"id": "p1", "name": "P", "snapshot_id": "s1"}], [])
+
+    with respx.mock:  # any Apple Music request would fail as unmocked
+        results = await sync_playlists(spotify, client, "user", path)
+
+    assert [result.skipped for result in results] == [True]
+    spotify.playlist_items.assert_not_called()
+
+
+async def test_changed_playlist_only_syncs_added_tracks(client, tmp_path):
+    path = tmp_path / "user.json"
+    SyncState(
+        playlists={
+            "p1": PlaylistState(
+                snapshot_id="s1",
+                apple_playlist_id="p.1",
+                tracks={key(TRACK_A): "a1", key(TRACK_B): "b1"},
+            )
+        }
+    ).save(path)
+    track_c = make_track("C", "ISRC_C")
+    spotify = make_spotify(
+        [{"id": "p1", "name": "P", "snapshot_id": "s2"}], [TRACK_A, track_c]
+    )
+
+    with respx.mock:
+        search = respx.get(SONGS_URL).mock(
+            return_value=Response(
+                200, json={"data": [{"id": "c1", "attributes": {"isrc": "ISRC_C"}}]}
+            )
+        )
+        add = respx.post(f"{LIBRARY_URL}/p.1/tracks").mock(return_value=Response(204))
+        [result] = await sync_playlists(spotify, client, "user", path)
+
+    assert search.call_count == 1
+    assert search.calls.last.request.url.params["filter[isrc]"] == "ISRC_C"
+    assert json.loads(add.calls.last.request.content) == {
+        "data": [{"id": "c1", "type": "songs"}]
+    }
+    assert result.added == [key(track_c)]
+    assert result.removed == [key(TRACK_B)]
+
+    state = SyncState.load(path).playlists["p1"]
+    assert state.snapshot_id == "s2"
+    assert state.tracks == {key(TRACK_A): "a1", key(track_c): "c1"}
+    assert state.orphaned == {key(TRACK_B): "b1"}
+
+
+async def test_unmatched_tracks_are_retried(client, tmp_path):
+    path = tmp_path / "user.json"
+    SyncState(
+        playlists={
+            "p1": PlaylistState(
+                snapshot_id="s1", apple_playlist_id="p.1", tracks={key(TRACK_A): None}
+            )
+        }
+    ).save(path)
+    spotify = make_spotify(
+        [{"id": "p1", "name": "P", "snapshot_id": "s2"}], [TRACK_A, TRACK_B]
+    )
+
+    with respx.mock:
+        search = respx.get(SONGS_URL).mock(
+            return_value=Response(
+                200,
+                json={
+                    "data": [
+                        {"id": "a1", "attributes": {"isrc": "ISRC_A"}},
+                        {"id": "b1", "attributes": {"isrc": "ISRC_B"}},
+                    ]
+                },
+            )
+        )
+        add = respx.post(f"{LIBRARY_URL}/p.1/tracks").mock(return_value=Response(204))
+        [result] = await sync_playlists(spotify, client, "user", path)
+
+    assert search.calls.last.request.url.params["filter[isrc]"] == "ISRC_A,ISRC_B"
+    assert json.loads(add.calls.last.request.content) == {
+        "data": [{"id": "a1", "type": "songs"}, {"id": "b1", "type": "songs"}]
+    }
+    assert result.added == [key(TRACK_A), key(TRACK_B)]
+    state = SyncState.load(path).playlists["p1"]
+    assert state.tracks == {key(TRACK_A): "a1", key(TRACK_B): "b1"}
+
+
+async def test_orphaned_songs_are_not_added_twice(client, tmp_path):
+    path = tmp_path / "user.json"
+    renamed_a = {**TRACK_A, "name": "A (Remastered)"}
+    SyncState(
+        playlists={
+            "p1": PlaylistState(
+                snapshot_id="s1",
+                apple_playlist_id="p.1",
+                tracks={key(renamed_a): "a1"},
+                orphaned={key(TRACK_B): "b1"},
+            )
+        }
+    ).save(path)
+    # B is re-added and A's metadata changed, but both songs are already in Apple Music
+    spotify = make_spotify(
+        [{"id": "p1", "name": "P", "snapshot_id": "s2"}], [TRACK_A, TRACK_B]
+    )
+
+    with respx.mock:
+        respx.get(SONGS_URL).mock(
+            return_value=Response(
+                200, json={"data": [{"id": "a1", "attributes": {"isrc": "ISRC_A"}}]}
+            )
+        )
+        add = respx.post(f"{LIBRARY_URL}/p.1/tracks")
+        await sync_playlists(spotify, client, "user", path)
+
+    assert not add.called
+    state = SyncState.load(path).playlists["p1"]
+    assert state.tracks == {key(TRACK_A): "a1", key(TRACK_B): "b1"}
+    assert state.orphaned == {}
+
+
+async def test_duplicate_tracks_are_kept(client, tmp_path):
+    spotify = make_spotify(
+        [{"id": "p1", "name": "P", "snapshot_id": "s1"}], [TRACK_A, TRACK_A]
+    )
+
+    with respx.mock:
+        respx.get(SONGS_URL).mock(
+            return_value=Response(
+                200, json={"data": [{"id": "a1", "attributes": {"isrc": "ISRC_A"}}]}
+            )
+        )
+        respx.post(LIBRARY_URL).mock(
+            return_value=Response(201, json={"data": [{"id": "p.1"}]})
+        )
+        add = respx.post(f"{LIBRARY_URL}/p.1/tracks").mock(return_value=Response(204))
+        await sync_playlists(spotify, client, "user", tmp_path / "user.json")
+
+    assert json.loads(add.calls.last.request.content) == {
+        "data": [{"id": "a1", "type": "songs"}, {"id": "a1", "type": "songs"}]
+    }
+
+
+async def test_failed_playlist_does_not_stop_sync(client, tmp_path):
+    path = tmp_path / "user.json"
+    SyncState(
+        playlists={"p2": PlaylistState(snapshot_id="s2", apple_playlist_id="p.2")}
+    ).save(path)
+    spotify = make_spotify(
+        [
+            {"id": "p1", "name": "New", "snapshot_id": "s1"},
+            {"id": "p2", "name": "Unchanged", "snapshot_id": "s2"},
+        ],
+        [TRACK_A],
+    )
+
+    with respx.mock:
+        respx.get(SONGS_URL).mock(
+            return_value=Response(
+                200, json={"data": [{"id": "a1", "attributes": {"isrc": "ISRC_A"}}]}
+            )
+        )
+        respx.post(LIBRARY_URL).mock(
+            return_value=Response(201, json={"data": [{"id": "p.1"}]})
+        )
+        respx.post(f"{LIBRARY_URL}/p.1/tracks").mock(return_value=Response(500))
+        failed, skipped = await sync_playlists(spotify, client, "user", path)
+
+    assert failed.error and "500" in failed.error
+    assert skipped.skipped
+    # the created Apple Music playlist is remembered, so a retry won't create another
+    assert SyncState.load(path).playlists["p1"].apple_playlist_id == "p.1"